@@ -44,6 +44,12 @@ class Name(Node):
 
 class Expression(Node):
 
+    # Ownership flags set by the flow pass on the expressions whose values may be moved (symbols, attributes and tuples)
+    # or copied (elements) into a variable or argument, and the call receiving them, if any
+    check_move = False
+    check_copy = False
+    copy_or_move_call = None
+
     def __init__(self, pos):
         Node.__init__(self, pos)
         self.type = None
@@ -185,7 +191,6 @@ class Symbol(Expression):
         self.internal_name = internal_name
         self.type = typ
         self.derivation_types = derivation_types
-        self.check_move = False
 
     def get_name(self):
         return self.internal_name if self.internal_name is not None else self.name
@@ -209,7 +214,6 @@ class Attribute(Expression):
         self.obj = obj
         self.attribute = attribute
         self.derivation_types = None
-        self.check_move = False
 
     def get_name(self):
         if isinstance(self.obj, Attribute):
@@ -227,7 +231,6 @@ class Element(Expression):
         Expression.__init__(self, pos)
         self.obj = obj
         self.key = key
-        self.check_copy = False
 
     def get_name(self):
         obj_name = self.obj.get_name()
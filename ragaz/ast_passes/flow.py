@@ -81,6 +81,11 @@ class CondBranch(util.Repr):
 
 class Phi(util.Repr):
 
+    # A phi value is assigned and passed to calls like an expression, but `check_move_or_copy` never marks it
+    check_move = False
+    check_copy = False
+    copy_or_move_call = None
+
     def __init__(self, pos, left, right):
         self.pos = pos
         self.left = left
@@ -136,9 +141,17 @@ class Block(util.Repr):
         for id, step in enumerate(self.steps):
             step.id = id
 
+    def reversed_steps(self):
+        """
+        Return the steps from the last to the first one. This order is used by the passes which analyse the flow from
+        bottom to top. As `push_step` and `insert_step` always set the step's id to its position in the list, no
+        sorting is needed.
+        """
+        return reversed(self.steps)
+
     def last_step(self):
         # Once end EndScope is not a valid step but a helper, this function returns the last valid step
-        for step in sorted(self.steps, key=lambda stp: stp.id, reverse=True):
+        for step in self.reversed_steps():
             if not isinstance(step, EndScope):
                 return step
         return None
@@ -162,16 +175,38 @@ class Flow(util.Repr):
 
     def __init__(self):
         self.blocks = []
+        self.sorted_blocks = None
+        self.blocks_in_reverse = None
         self.yields = {}
 
     def create_block(self, annotation):
         id = len(self.blocks)
         block = Block(id, annotation)
         self.blocks.append(block)
+        self.sorted_blocks = self.blocks_in_reverse = None
         return block
 
     def remove_block(self, block):
         self.blocks.remove(block)
+        self.sorted_blocks = self.blocks_in_reverse = None
+
+    def ordered_blocks(self):
+        """
+        Return the blocks from the first to the last one. Different from steps, the blocks' ids aren't always in the
+        list order (a block created after a removal reuses the id of the last block), so the blocks are sorted only
+        once and the list is discarded when a block is created or removed.
+        """
+        if self.sorted_blocks is None:
+            self.sorted_blocks = sorted(self.blocks, key=lambda blk: blk.id)
+        return self.sorted_blocks
+
+    def reversed_blocks(self):
+        """
+        Return the blocks from the last to the first one, sorted and cached like in `ordered_blocks`.
+        """
+        if self.blocks_in_reverse is None:
+            self.blocks_in_reverse = sorted(self.blocks, key=lambda blk: blk.id, reverse=True)
+        return self.blocks_in_reverse
 
 
 ATOMIC = ast.NoneVal, ast.Byte, ast.Bool, ast.Int, ast.Float, ast.Symbol, ast.Attribute, ast.Element
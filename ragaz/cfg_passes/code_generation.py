@@ -156,14 +156,12 @@ class CodeGenerator(object):
                 dst_value = Value(dst_value.type.over, loaded)
                 src_type_wrap_levels -= 1
 
-            numeric_types = types.INTEGERS | types.FLOATS
-
             # Once unwrapped source's type already is the target type just return the converted value
             if unwrapped_src_type == unwrapped_dst_type:
                 return dst_value
 
             # Cast the src value to dst type if both are numeric
-            elif unwrapped_src_type in numeric_types and unwrapped_dst_type in numeric_types:
+            elif unwrapped_src_type in types.NUMERICS and unwrapped_dst_type in types.NUMERICS:
 
                 src_num_bits = types.BASIC[unwrapped_src_type.name]["num_bits"]
                 dst_num_bits = types.BASIC[unwrapped_dst_type.name]["num_bits"]
@@ -298,7 +296,7 @@ class CodeGenerator(object):
 
         # Objects like list's elements cannot be moved but only copied. Thus, we first check which type of
         # operation must be performed, and copy the object if necessary
-        if hasattr(node, "check_copy") and node.check_copy:
+        if node.check_copy:
             typ = types.unwrap(src.type)
             if "__copy__" in typ.methods:
                 copy_fn = typ.select(module=self.module, node=node, name="__copy__", positional=[None], named={})
@@ -1036,8 +1034,7 @@ class CodeGenerator(object):
                "not": "not"}
 
         # If both left and right expression are numeric values generate IR objects for general mathematical operation
-        numeric_types = types.INTEGERS | types.FLOATS
-        if types.unwrap(expression.type) in numeric_types:
+        if types.unwrap(expression.type) in types.NUMERICS:
 
             # Unwrap the types of the left and right expressions
             if types.is_wrapped(expression.type):
@@ -1101,8 +1098,7 @@ class CodeGenerator(object):
                "^": "xor"}
 
         # If both left and right expression are numeric values generate IR objects for general mathematical operation
-        numeric_types = types.INTEGERS | types.FLOATS
-        if types.unwrap(left.type) in numeric_types:
+        if types.unwrap(left.type) in types.NUMERICS:
 
             # Unwrap the types of the left and right expressions
             if types.is_wrapped(left.type):
@@ -2173,9 +2169,12 @@ class CodeGenerator(object):
 
 
 def generate_module_ir(target_machine, module):
+    """
+    Generate the LLVM IR of the module and return it as the LLVM assembly text, which is already needed to verify it.
+    """
     word_size = types.WORD_SIZE
     generator = CodeGenerator(target_machine, word_size)
     module_ir = generator.generate(module)
     module_ir_str = str(module_ir)
     llvm.parse_assembly(module_ir_str).verify()
-    return module_ir
+    return module_ir_str
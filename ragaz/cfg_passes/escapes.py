@@ -80,8 +80,8 @@ class EscapesAnalyser(object):
             if fn.self_type is not None:
                 self.escaping_objects.add("self")
 
-            for block in sorted(self.fn.flow.blocks, key=lambda blk: blk.id, reverse=True):
-                for step in sorted(block.steps, key=lambda stp: stp.id, reverse=True):
+            for block in self.fn.flow.reversed_blocks():
+                for step in block.reversed_steps():
                     self.visit(step)
 
             for arg in fn.args:
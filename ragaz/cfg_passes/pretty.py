@@ -21,8 +21,12 @@ class Prettifier(object):
     def process(self):
         self.pretty_ir = []
 
+        # Every function is printed independently of the others, so its text is just collected in the same order of
+        # the module's functions
         for fn in self.module.functions:
-            self.visit_function(fn)
+            text = self.visit_function(fn)
+            if text is not None:
+                self.pretty_ir.append(text)
 
         return self.pretty_ir
 
@@ -76,7 +80,7 @@ class Prettifier(object):
                                                               step=step_text)
                         step_id += 1
 
-            self.pretty_ir.append("{signature}:\n{suite}".format(signature=signature, suite=suite))
+            return "{signature}:\n{suite}".format(signature=signature, suite=suite)
 
     def visit_beginscope(self, node):
         return ""
@@ -29,12 +29,25 @@ from ragaz.cfg_passes import typing
 
 PASS_NAME = __name__.split(".")[-1]
 
+GENERIC_TYPES = frozenset(["anytype", "anyint", "anyfloat"])
+ANY_TYPE = frozenset(["anytype"])
+
 
 class Specializer(object):
 
+    # Visit methods indexed by the class of the node. It's filled as the classes are visited for the first time, thus
+    # the method name is built only once per class instead of once per node
+    visitors = {}
+
     def __init__(self, module):
         self.module = module
         self.fn = None
+        self.generic_cache = {}
+        self.derived_types_cache = {}
+
+        # Default-sized types which generic integers and floats become when no type can be inferred
+        self.int_type = module.instance_type("int")
+        self.float_type = module.instance_type("float")
 
     def process(self):
 
@@ -46,23 +59,19 @@ class Specializer(object):
         This used to replace a generic integer ("anyint") or float ("anyfloat") to a number with defined size (i8, i32,
         double, etc).
         """
-        if types.is_wrapped(src_type):
-            Wrapper = src_type.__class__
-        else:
-            Wrapper = None
-        unwrapped_src_type = types.unwrap(src_type)
+        Wrapper, unwrapped_src_type = types.peel(src_type)
 
         dst_type = types.unwrap(dst_type)
         if dst_type is not None and (self.is_generic(dst_type) or isinstance(dst_type, types.Trait)):
             dst_type = None
 
-        if unwrapped_src_type.name in ["anytype", "anyint", "anyfloat"]:
+        if unwrapped_src_type.name in GENERIC_TYPES:
             if dst_type is None:
-                if unwrapped_src_type == self.module.instance_type("anyint"):
-                    dst_type = self.module.instance_type("int")
-                elif unwrapped_src_type == self.module.instance_type("anyfloat"):
-                    dst_type = self.module.instance_type("float")
-                elif unwrapped_src_type == self.module.instance_type("anytype"):
+                if unwrapped_src_type.name == "anyint":
+                    dst_type = self.int_type
+                elif unwrapped_src_type.name == "anyfloat":
+                    dst_type = self.float_type
+                else:
                     assert False, "No type was specified to specialize"
             if Wrapper is not None:
                 dst_type = Wrapper(dst_type)
@@ -73,8 +82,7 @@ class Specializer(object):
                 dst_type_element = dst_type.elements[i] if dst_type is not None else None
                 typ = self.specialize(unwrapped_src_type.elements[i], dst_type_element)
                 element_types.append(typ)
-            dst_type = self.module.instance_type(ast.DerivedType(None, typ_name, element_types),
-                                                 translations=self.translations)
+            dst_type = self.derive_type(typ_name, element_types)
             if Wrapper is not None:
                 dst_type = Wrapper(dst_type)
         elif dst_type is None or unwrapped_src_type == dst_type:
@@ -89,42 +97,69 @@ class Specializer(object):
 
         return dst_type
 
-    def is_generic(self, typ, generic_types=["anytype", "anyint", "anyfloat"]):
+    def is_generic(self, typ, generic_types=GENERIC_TYPES):
         """
         Check if type have a generic integer or float that still wasn't converted to a type with specific size like
         i8, i32, double, etc. This conversion is made by the `specialize` pass.
         """
         typ = types.unwrap(typ)
 
-        if hasattr(typ, "elements"):
-            is_non_specialized = any([self.is_generic(tp, generic_types) for tp in typ.elements])
-            if is_non_specialized:
-                typ.is_non_specialized = is_non_specialized
-            return is_non_specialized
-
+        # Generic types are leaves (ie. neither derived from a template nor data), which are the most common ones, thus
+        # the name is checked before probing the kind of the type
+        if typ.name in generic_types:
+            is_non_specialized = True
         elif isinstance(typ, types.Data):
             is_non_specialized = self.is_generic(typ.over, generic_types)
-            if is_non_specialized:
-                typ.is_non_specialized = is_non_specialized
-            return is_non_specialized
-
+        elif hasattr(typ, "elements"):
+
+            # The answer never changes for the same derived type, so its elements are traversed only once per type.
+            # The type is kept in the cache to avoid that its id be reused by another object
+            key = (id(typ), generic_types)
+            if key in self.generic_cache:
+                return self.generic_cache[key][1]
+
+            # All elements are checked, even after a generic one is found, so that every generic element is flagged as
+            # non specialized too
+            is_non_specialized = False
+            for tp in typ.elements:
+                if self.is_generic(tp, generic_types):
+                    is_non_specialized = True
+            self.generic_cache[key] = (typ, is_non_specialized)
         else:
-            is_non_specialized = typ.name in generic_types
-            if is_non_specialized:
-                typ.is_non_specialized = is_non_specialized
-            return is_non_specialized
+            is_non_specialized = False
+
+        if is_non_specialized:
+            typ.is_non_specialized = is_non_specialized
+        return is_non_specialized
+
+    def derive_type(self, template_name, element_types):
+        """
+        Return the type derived from a template like list<T>, tuple<T1, T2>, etc. using the already specialized element
+        types. Derived types are stored in the module by their names, thus the same template and element names always
+        return the same type object and it is only necessary to build the derivation once.
+        """
+        key = (template_name, tuple(tp.name if tp is not None else None for tp in element_types))
+        typ = self.derived_types_cache.get(key, None)
+        if typ is None:
+            typ = self.module.instance_type(ast.DerivedType(None, template_name, element_types),
+                                            translations=self.translations)
+            self.derived_types_cache[key] = typ
+        return typ
 
     def is_anytype(self, typ):
-        return self.is_generic(typ, generic_types=["anytype"])
+        return self.is_generic(typ, generic_types=ANY_TYPE)
 
     def visit(self, node, typ=None):
         """
         This is used for call the proper visit method for a node. If node, for instance, is an ast.String, then
         this method will call `visit_string` method to handle the node properly.
         """
-        fn_name = "visit_" + str(node.__class__.__name__).lower()
-        visit_node_fn = getattr(self, fn_name)
-        visit_node_fn(node, typ)
+        node_class = node.__class__
+        visit_node_fn = self.visitors.get(node_class, None)
+        if visit_node_fn is None:
+            fn_name = "visit_" + node_class.__name__.lower()
+            visit_node_fn = self.visitors[node_class] = getattr(self.__class__, fn_name)
+        visit_node_fn(self, node, typ)
 
     # Node visitation methods
 
@@ -133,29 +168,28 @@ class Specializer(object):
         Start the analysis.
         """
         util.check_previous_pass(self.module, fn, PASS_NAME)
-        if PASS_NAME not in fn.passes:
+
+        # Templates are never walked, so there is no need to check whether they are derived from generic numbers
+        if PASS_NAME not in fn.passes and types.is_concrete(fn, include_non_specialized=True):
 
             # Check if the function is derived for non-specialized integers or floats
-            if fn.self_type is not None and self.is_generic(fn.self_type):
+            type_vars = fn.get_all_type_vars()
+            if ((fn.self_type is not None and self.is_generic(fn.self_type)) or
+                    any(self.is_generic(derived_type) for derived_type in type_vars.values())):
                 fn.is_non_specialized = True
-            else:
-                for _, derived_type in fn.get_all_type_vars().items():
-                    if self.is_generic(derived_type):
-                        fn.is_non_specialized = True
-                        break
 
             if types.is_concrete(fn):
                 self.fn = fn
 
-                # Set the module to translate types based on these 'type_vars'
-                translations = {}
-                translations.update(fn.get_all_type_vars())
+                # Set the module to translate types based on these 'type_vars'. As `get_all_type_vars` always returns
+                # a new dictionary, it can be used directly as translations
+                translations = type_vars
                 if fn.self_type is not None:
                     translations["Self"] = fn.self_type
                 self.translations = translations
 
-                for block in sorted(self.fn.flow.blocks, key=lambda blk: blk.id, reverse=True):
-                    for step in sorted(block.steps, key=lambda stp: stp.id, reverse=True):
+                for block in self.fn.flow.reversed_blocks():
+                    for step in block.reversed_steps():
                         self.visit(step)
 
         fn.passes.append(PASS_NAME)
@@ -166,11 +200,11 @@ class Specializer(object):
     def visit_endscope(self, node, typ=None):
         pass
 
-    def unary_op(self, node, typ):
+    def unary_op(self, node, typ=None):
         self.visit(node.value, typ)
         node.type = node.value.type
 
-    def binary_op(self, node, typ):
+    def binary_op(self, node, typ=None):
         if self.is_generic(node.left.type) and self.is_generic(node.right.type):
             self.visit(node.left)
             self.visit(node.right)
@@ -181,6 +215,30 @@ class Specializer(object):
             self.visit(node.right, node.left.type)
             self.visit(node.left)
 
+    def get_biggest_element_type(self, elements):
+        """
+        Return the biggest type among the types of the elements of a collection, or None if it has no elements.
+        """
+        elements = iter(elements)
+        first_element = next(elements, None)
+        if first_element is None:
+            return None
+        biggest_element_type = first_element.type
+        for element in elements:
+            biggest_element_type = types.choose_bigger_type(biggest_element_type, element.type)
+        return biggest_element_type
+
+    def check_num_elements(self, node):
+        """
+        Check that the number of elements of an array or memory manipulation is of an integer type.
+        """
+        if node.num_elements.type not in types.INTEGERS:
+            msg = (node.num_elements.pos, "number of elements must be a value of integer type ('{type}' not allowed)"
+                   .format(type=node.num_elements.type.name))
+            hints = ["Use 'as' keyword to convert values.",
+                     "Create a magic method to convert implicitly the values."]
+            raise util.Error([msg], hints=hints)
+
     # Basic types
 
     def visit_noneval(self, node, typ=None):
@@ -208,12 +266,7 @@ class Specializer(object):
 
     def visit_array(self, node, typ=None):
         self.visit(node.num_elements)
-        if node.num_elements.type not in types.INTEGERS:
-            msg = (node.num_elements.pos, "number of elements must be a value of integer type ('{type}' not allowed)"
-                   .format(type=node.num_elements.type.name))
-            hints = ["Use 'as' keyword to convert values.",
-                     "Create a magic method to convert implicitly the values."]
-            raise util.Error([msg], hints=hints)
+        self.check_num_elements(node)
 
     def visit_string(self, node, typ=None):
         pass
@@ -221,12 +274,19 @@ class Specializer(object):
     def visit_tuple(self, node, typ=None):
 
         if self.is_generic(node.type):
+
+            # Use the elements of the destination tuple as base only if it's already specialized
+            if typ is not None and not self.is_generic(typ):
+                is_reference_to_tuple = types.is_reference(typ)
+                right_types = types.unwrap(typ).elements
+            else:
+                right_types = None
+
             element_types = []
             for i, element_type in enumerate(types.unwrap(node.type).elements):
                 if self.is_generic(element_type):
-                    if typ is not None and not self.is_generic(typ):
-                        is_reference_to_tuple = types.is_reference(typ)
-                        right_type = types.unwrap(typ).elements[i]
+                    if right_types is not None:
+                        right_type = right_types[i]
                         if is_reference_to_tuple:
                             right_type = types.Wrapper(right_type, is_reference=True)
                         element_type = self.specialize(element_type, right_type)
@@ -235,14 +295,14 @@ class Specializer(object):
                 element_types.append(element_type)
 
             # Finally update the type of list with the element type found after specialization
-            base_type = self.module.instance_type(ast.DerivedType(None, "tuple", element_types),
-                                                  translations=self.translations)
+            base_type = self.derive_type("tuple", element_types)
             node.type = self.specialize(node.type, base_type)
 
         # Now specialize all elements using the specialized type as base in case of generics
+        element_types = types.unwrap(node.type).elements
         for i, element in enumerate(node.elements):
             if self.is_generic(element.type):
-                self.visit(element, types.unwrap(node.type).elements[i])
+                self.visit(element, element_types[i])
 
     def visit_list(self, node, typ=None):
 
@@ -255,16 +315,10 @@ class Specializer(object):
                 element_type = typ.over.elements[0]
             else:
                 # Get the elements' type of the list if no one was passed
-                element_type = None
-                for element in node.elements:
-                    if element_type is None:
-                        element_type = element.type
-                    else:
-                        element_type = types.choose_bigger_type(element_type, element.type)
+                element_type = self.get_biggest_element_type(node.elements)
 
             # Finally update the type of list with the element type found after specialization
-            base_type = self.module.instance_type(ast.DerivedType(None, "list", [element_type]),
-                                                  translations=self.translations)
+            base_type = self.derive_type("list", [element_type])
             node.type = self.specialize(node.type, base_type)
 
         # Now specialize all elements using the specialized type as base in case of generics
@@ -278,13 +332,8 @@ class Specializer(object):
             if typ is not None and not self.is_generic(typ.over.elements[idx]):
                 element_type = typ.over.elements[idx]
             else:
-                # Get the elements' type of the set if no one was passed
-                element_type = None
-                for element in elements:
-                    if element_type is None:
-                        element_type = element.type
-                    else:
-                        element_type = types.choose_bigger_type(element_type, element.type)
+                # Get the elements' type of the dict if no one was passed
+                element_type = self.get_biggest_element_type(elements)
             return element_type
 
         if self.is_generic(node.type):
@@ -292,8 +341,7 @@ class Specializer(object):
             value_type = specialize_element(1, node.elements.values())
 
             # Finally update the type of dict with the key and value types found after specialization
-            base_type = self.module.instance_type(ast.DerivedType(None, "dict", [key_type, value_type]),
-                                                  translations=self.translations)
+            base_type = self.derive_type("dict", [key_type, value_type])
             node.type = self.specialize(node.type, base_type)
 
         # Now specialize all dict elements using the specialized type as base in case of generics
@@ -310,16 +358,10 @@ class Specializer(object):
                 element_type = typ.over.elements[0]
             else:
                 # Get the elements' type of the set if no one was passed
-                element_type = None
-                for element in node.elements:
-                    if element_type is None:
-                        element_type = element.type
-                    else:
-                        element_type = types.choose_bigger_type(element_type, element.type)
+                element_type = self.get_biggest_element_type(node.elements)
 
             # Finally update the type of set with the element type found after specialization
-            base_type = self.module.instance_type(ast.DerivedType(None, "set", [element_type]),
-                                                  translations=self.translations)
+            base_type = self.derive_type("set", [element_type])
             node.type = self.specialize(node.type, base_type)
 
         # Now specialize all elements using the specialized type as base in case of generics
@@ -342,64 +384,41 @@ class Specializer(object):
         self.visit(node.obj)
         self.visit(node.key)
         if self.is_generic(node.type):
-            if node.obj.type.name.startswith("data<"):
-                node.type = self.specialize(node.type, node.obj.type.over)
-            elif node.obj.type.name.startswith("tuple<"):
-                node.type = self.specialize(node.type, node.obj.type.over.elements[node.key.literal + 1])
-            elif node.obj.type.name.startswith("dict<"):
-                node.type = self.specialize(node.type, node.obj.type.over.elements[1])
+            obj_type = node.obj.type
+
+            # Get the name of the template from which the object's type was derived, ie. 'tuple' from 'tuple<T1, T2>'
+            template_name = obj_type.name.partition("<")[0]
+            if template_name == "data":
+                node.type = self.specialize(node.type, obj_type.over)
+            elif template_name == "tuple":
+                node.type = self.specialize(node.type, obj_type.over.elements[node.key.literal + 1])
+            elif template_name == "dict":
+                node.type = self.specialize(node.type, obj_type.over.elements[1])
             else:
-                node.type = self.specialize(node.type, node.obj.type.over.elements[0])
+                node.type = self.specialize(node.type, obj_type.over.elements[0])
 
     def visit_setelement(self, node, typ=None):
         self.visit_element(node)
 
     # Boolean operators
 
-    def visit_not(self, node, typ=None):
-        self.unary_op(node, typ)
-
-    def boolean(self, node):
+    def boolean(self, node, typ=None):
         self.visit(node.left)
         self.visit(node.right)
 
-    def visit_and(self, node, typ=None):
-        self.boolean(node)
-
-    def visit_or(self, node, typ=None):
-        self.boolean(node)
+    visit_not = unary_op
+    visit_and = visit_or = boolean
 
     # Comparison operators
 
     def visit_is(self, node, typ=None):
         self.visit(node.left)
 
-    def compare(self, node, typ):
-        self.binary_op(node, typ)
-
-    def visit_equal(self, node, typ=None):
-        self.compare(node, typ)
-
-    def visit_notequal(self, node, typ=None):
-        self.compare(node, typ)
-
-    def visit_lowerthan(self, node, typ=None):
-        self.compare(node, typ)
-
-    def visit_lowerequal(self, node, typ=None):
-        self.compare(node, typ)
-
-    def visit_greaterthan(self, node, typ=None):
-        self.compare(node, typ)
-
-    def visit_greaterequal(self, node, typ=None):
-        self.compare(node, typ)
+    visit_equal = visit_notequal = binary_op
+    visit_lowerthan = visit_lowerequal = visit_greaterthan = visit_greaterequal = binary_op
 
     # Arithmetic operators
 
-    def arith(self, node, typ):
-        self.binary_op(node, typ)
-
     def visit_neg(self, node, typ=None):
 
         # Check if this operation is involving signed numbers
@@ -413,49 +432,12 @@ class Specializer(object):
 
         self.unary_op(node, typ)
 
-    def visit_add(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_sub(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_mod(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_mul(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_div(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_floordiv(self, node, typ=None):
-        self.arith(node, typ)
-
-    def visit_pow(self, node, typ=None):
-        self.arith(node, typ)
+    visit_add = visit_sub = visit_mod = visit_mul = visit_div = visit_floordiv = visit_pow = binary_op
 
     # Bitwise operators
 
-    def bitwise(self, node, typ):
-        self.binary_op(node, typ)
-
-    def visit_bwnot(self, node, typ=None):
-        self.unary_op(node, typ)
-
-    def visit_bwand(self, node, typ=None):
-        self.bitwise(node, typ)
-
-    def visit_bwor(self, node, typ=None):
-        self.bitwise(node, typ)
-
-    def visit_bwxor(self, node, typ=None):
-        self.bitwise(node, typ)
-
-    def visit_bwshiftleft(self, node, typ=None):
-        self.bitwise(node, typ)
-
-    def visit_bwshiftright(self, node, typ=None):
-        self.bitwise(node, typ)
+    visit_bwnot = unary_op
+    visit_bwand = visit_bwor = visit_bwxor = visit_bwshiftleft = visit_bwshiftright = binary_op
 
     # Control flow
 
@@ -490,6 +472,8 @@ class Specializer(object):
         # translations are inferred from call's args
         positional, named = typing.organize_args(node.args)
         if isinstance(node.fn, ast.Function):
+
+            # A list (and not a generator) is passed so that every generic type var is flagged as non specialized
             fn_is_generic = any([self.is_generic(typ) for typ in node.fn.get_all_type_vars().values()])
             if fn_is_generic:
 
@@ -587,8 +571,8 @@ class Specializer(object):
 
             # Specialize the type for every variable
             if isinstance(node.variables, ast.Tuple):
-                for i, var in enumerate(node.variables.elements):
-                    self.visit(var, right_type.over.elements[i])
+                for var, element_type in zip(node.variables.elements, right_type.over.elements):
+                    self.visit(var, element_type)
 
             # Specialize the type of the single variable
             else:
@@ -628,37 +612,20 @@ class Specializer(object):
     def visit_del(self, node, typ=None):
         self.visit(node.obj)
 
-    def visit_reallocmemory(self, node, typ=None):
-        self.visit(node.obj)
+    def memory_op(self, node, operands):
+        for operand in operands:
+            self.visit(operand)
         self.visit(node.num_elements)
-        if node.num_elements.type not in types.INTEGERS:
-            msg = (node.num_elements.pos, "number of elements must be a value of integer type ('{type}' not allowed)"
-                   .format(type=node.num_elements.type.name))
-            hints = ["Use 'as' keyword to convert values.",
-                     "Create a magic method to convert implicitly the values."]
-            raise util.Error([msg], hints=hints)
+        self.check_num_elements(node)
+
+    def visit_reallocmemory(self, node, typ=None):
+        self.memory_op(node, [node.obj])
 
     def visit_copymemory(self, node, typ=None):
-        self.visit(node.src)
-        self.visit(node.dst)
-        self.visit(node.num_elements)
-        if node.num_elements.type not in types.INTEGERS:
-            msg = (node.num_elements.pos, "number of elements must be a value of integer type ('{type}' not allowed)"
-                   .format(type=node.num_elements.type.name))
-            hints = ["Use 'as' keyword to convert values.",
-                     "Create a magic method to convert implicitly the values."]
-            raise util.Error([msg], hints=hints)
+        self.memory_op(node, [node.src, node.dst])
 
     def visit_movememory(self, node, typ=None):
-        self.visit(node.src)
-        self.visit(node.dst)
-        self.visit(node.num_elements)
-        if node.num_elements.type not in types.INTEGERS:
-            msg = (node.num_elements.pos, "number of elements must be a value of integer type ('{type}' not allowed)"
-                   .format(type=node.num_elements.type.name))
-            hints = ["Use 'as' keyword to convert values.",
-                     "Create a magic method to convert implicitly the values."]
-            raise util.Error([msg], hints=hints)
+        self.memory_op(node, [node.src, node.dst])
 
     def visit_reference(self, node, typ=None):
         self.visit(node.value, typ)
@@ -24,28 +24,50 @@ from ragaz.ast_passes import flow
 
 PASS_NAME = __name__.split(".")[-1]
 
+# Types of the literals which global variables can be initialized with when no type is declared for them
+LITERAL_TYPE_NAMES = {
+    ast.Bool: "bool",
+    ast.Byte: "byte",
+    ast.Int: "int",
+    ast.Float: "float",
+    ast.String: "str",
+}
+
 
 def organize_args(args):
-    positional, named, last_named_arg = [], {}, None
-    for arg in args:
+
+    # Named arguments must come after all non-named ones, thus the positional arguments are those before the first
+    # named argument. Most calls have no named arguments at all
+    num_positional = len(args)
+    for i, arg in enumerate(args):
         if isinstance(arg, ast.NamedArg):
-            named[arg.name] = arg.value.type
-            last_named_arg = arg.name
-        elif len(named) > 0:
+            num_positional = i
+            break
+    positional = [arg.type for arg in args[:num_positional]]
+
+    named, last_named_arg = {}, None
+    for arg in args[num_positional:]:
+        if not isinstance(arg, ast.NamedArg):
             msg = (arg.pos, "non-named arguments must come before named arguments")
             hints = ["Move this value to front of '{named_arg}'.".format(named_arg=last_named_arg)]
             raise util.Error([msg], hints=hints)
-        else:
-            positional.append(arg.type)
+        named[arg.name] = arg.value.type
+        last_named_arg = arg.name
     return positional, named
 
 
 class Typer(object):
 
+    # Visit methods indexed by the class of the node. It's filled as the classes are visited for the first time, thus
+    # the method name is built only once per class instead of once per node
+    visitors = {}
+
     def __init__(self, module):
         self.module = module
         self.fn = None
         self.definitions = None
+        self.fn_arg_names = None
+        self.derived_types_cache = {}
 
     def process(self):
 
@@ -61,89 +83,106 @@ class Typer(object):
         # architecture
         if self.module.is_core:
             def copy_type(dst_type, src_type):
-                self.module.symbols[dst_type] = node = copy.deepcopy(self.module.symbols[src_type])
+                src_node = self.module.symbols[src_type]
+                self.module.symbols[dst_type] = node = copy.copy(src_node)
                 node.name = dst_type
 
+                # Only the methods are changed by the next passes, thus they are the only ones which need to be copied
+                # deeply. The copies must refer to the new type instead of the source one
+                node.methods = copy.deepcopy(src_node.methods, {id(src_node): node})
+
             copy_type("int", "i" + str(types.WORD_SIZE))
             copy_type("uint", "u" + str(types.WORD_SIZE))
             copy_type("float", "f64")
 
-        # Add type aliases
+        # Separate the module's symbols by kind in a single walk, as each kind is handled in its own step below
+        aliases, classes_and_traits, functions, globals_ = [], [], [], []
         for name, node in self.module.symbols.current_itens.items():
             if isinstance(node, module_.TypeAlias):
-                self.module.types[name] = node
+                aliases.append((name, node))
+            elif isinstance(node, (ast.Class, ast.Trait)):
+                if len(node.type_vars) == 0:
+                    classes_and_traits.append((name, node))
+            elif isinstance(node, ast.Function):
+                if len(node.type_vars) == 0:
+                    functions.append((name, node))
+            elif isinstance(node, module_.Global):
+                globals_.append((name, node))
+
+        # Add type aliases
+        for name, node in aliases:
+            self.module.types[name] = node
 
         # Add basics, classes and traits type to module's types dictionary
-        for name, node in self.module.symbols.current_itens.items():
-            if isinstance(node, (ast.Class, ast.Trait)) and len(node.type_vars) == 0:
-                self.module.types[name] = typ = types.create_type_or_trait(node, node.name, node.name)
-                types.check_basic_type(typ)
+        for name, node in classes_and_traits:
+            self.module.types[name] = typ = types.create_type_or_trait(node, node.name, node.name)
+            types.check_basic_type(typ)
 
         # Finalize classes and traits types
-        for name, node in self.module.symbols.current_itens.items():
-            if isinstance(node, (ast.Class, ast.Trait)) and len(node.type_vars) == 0:
-                typ = self.module.types[node.name]
-                types.finalize_type_or_trait(self.module, typ)
-
-                if not isinstance(typ, types.Trait):
-                    for name in typ.methods:
-                        methods = typ.methods[name]
-                        self.module.functions.extend(methods)
+        for name, node in classes_and_traits:
+            typ = self.module.types[node.name]
+            types.finalize_type_or_trait(self.module, typ)
+
+            if not isinstance(typ, types.Trait):
+                for method_name in typ.methods:
+                    methods = typ.methods[method_name]
+                    self.module.functions.extend(methods)
+
+        # Types given to literals and to the results of logical operations. They are looked up only once, now that all
+        # types of the module are known
+        self.any_type = self.module.instance_type("anytype")
+        self.void_type = self.module.instance_type("void")
+        self.bool_type = self.module.instance_type("bool")
+        self.byte_type = self.module.instance_type("byte")
+        self.str_type = self.module.instance_type("str")
+        self.anyint_type = self.module.instance_type("anyint")
+        self.anyfloat_type = self.module.instance_type("anyfloat")
 
         # Set the type object for all functions except class methods
-        for name, node in self.module.symbols.current_itens.items():
-            if isinstance(node, ast.Function) and len(node.type_vars) == 0:
-
-                # Set the functions with the proper type
-                node.type = types.finalize_function_or_method(self.module, node)
-
-                if node.suite is not None:
-                    self.module.functions.append(node)
-
-                # Check function signature invariants for main() and methods
-                if name == "main":
-                    fn_types = self.module.symbols[node.name].type.over
-                    ret_type, args_types = fn_types["ret"], fn_types["args"]
-                    # TODO: Implement sys.argv with this:
-                    if len(node.args) > 0:
-                        if args_types[0].name != "list<str>":
-                            msg = (node.args[0].pos, "first and single argument to 'main()' must be of type 'list<str>'"
-                                                     " ('{type}' not allowed)".format(type=args_types[0].name))
-                            raise util.Error([msg])
-                    if ret_type not in {self.module.instance_type("void"), self.module.instance_type("i32")}:
-                        msg = (node.ret.pos, "'main()' must return either nothing or 'i32' ('{type}' not allowed)"
-                               .format(type=ret_type.name))
+        for name, node in functions:
+
+            # Set the functions with the proper type
+            node.type = types.finalize_function_or_method(self.module, node)
+
+            if node.suite is not None:
+                self.module.functions.append(node)
+
+            # Check function signature invariants for main() and methods
+            if name == "main":
+                fn_types = self.module.symbols[node.name].type.over
+                ret_type, args_types = fn_types["ret"], fn_types["args"]
+                # TODO: Implement sys.argv with this:
+                if len(node.args) > 0:
+                    if args_types[0].name != "list<str>":
+                        msg = (node.args[0].pos, "first and single argument to 'main()' must be of type 'list<str>'"
+                                                 " ('{type}' not allowed)".format(type=args_types[0].name))
                         raise util.Error([msg])
+                if ret_type not in (self.void_type, self.module.instance_type("i32")):
+                    msg = (node.ret.pos, "'main()' must return either nothing or 'i32' ('{type}' not allowed)"
+                           .format(type=ret_type.name))
+                    raise util.Error([msg])
 
         # Set the type object for the global variables
-        for name, node in self.module.symbols.current_itens.items():
-            if isinstance(node, module_.Global):
-
-                # Infer the global variable's type from its value
-                if node.value.type is None:
-                    if isinstance(node.value, ast.Bool):
-                        node.value.type = self.module.instance_type("bool")
-                    elif isinstance(node.value, ast.Byte):
-                        node.value.type = self.module.instance_type("byte")
-                    elif isinstance(node.value, ast.Int):
-                        node.value.type = self.module.instance_type("int")
-                    elif isinstance(node.value, ast.Float):
-                        node.value.type = self.module.instance_type("float")
-                    elif isinstance(node.value, ast.String):
-                        node.value.type = self.module.instance_type("str")
-                else:
-                    node.value.type = self.module.instance_type(node.value.type)
-                node.type = node.value.type
+        for name, node in globals_:
 
-                # Round the values if necessary
-                if node.value.type in types.FLOATS:
-                    node.value.literal = float(node.value.literal)
-                elif node.value.type in types.INTEGERS:
-                    node.value.literal = int(node.value.literal)
+            # Infer the global variable's type from its value
+            if node.value.type is None:
+                type_name = LITERAL_TYPE_NAMES.get(node.value.__class__, None)
+                if type_name is not None:
+                    node.value.type = self.module.instance_type(type_name)
+            else:
+                node.value.type = self.module.instance_type(node.value.type)
+            node.type = node.value.type
+
+            # Round the values if necessary
+            if node.value.type in types.FLOATS:
+                node.value.literal = float(node.value.literal)
+            elif node.value.type in types.INTEGERS:
+                node.value.literal = int(node.value.literal)
 
         # Use methods of default integer/float for 'anyint'/'anyfloat' (numbers with no size defined yet)
-        self.module.instance_type("anyint").methods.update(self.module.instance_type("int").methods)
-        self.module.instance_type("anyfloat").methods.update(self.module.instance_type("float").methods)
+        self.anyint_type.methods.update(self.module.instance_type("int").methods)
+        self.anyfloat_type.methods.update(self.module.instance_type("float").methods)
 
         # Visit the actual function code for type checking and inference of its statements
         # (needs to be done after add function declarations for each function)
@@ -157,7 +196,7 @@ class Typer(object):
         This method is used to raise an error if name's value is being modified but its type is immutable.
         """
         if util.MUTABILITY_CHECKING and not self.module.is_core:  # TODO: Remove CORE verification, because this check needs be done on it too
-            if self.fn.name not in ["__init__", "__new__"] and types.is_wrapped(val.type) and not val.type.is_mutable:
+            if self.fn.name not in {"__init__", "__new__"} and types.is_wrapped(val.type) and not val.type.is_mutable:
                 if isinstance(val, ast.Symbol):
                     obj = self.definitions[val.get_name()]
                 else:
@@ -175,24 +214,22 @@ class Typer(object):
         return symbol.name == "data" or symbol.name in self.module.types
 
     def check_symbol_definition(self, node, types_not_allowed=True):
-        symbol = None
 
         # Check if symbol is a local variable, and if yes, return the local variable
-        var = self.definitions.get(node.get_name(), None)
-        if var is not None:
-            symbol = var
-
-        # If symbol wasn't defined locally in any block of the function then check if is a global type and return it
-        elif node.name in self.module.types:
-            symbol = self.module.types[node.name]
-            if types_not_allowed:
+        symbol = self.definitions.get(node.get_name(), None)
+
+        # If symbol wasn't defined locally in any block of the function then check if is a global type and return it.
+        # Each scope of the module is searched only once, as a search may go through all imported objects
+        if symbol is None:
+            symbol = self.module.types.get(node.name, None)
+            if symbol is not None and types_not_allowed:
                 msg = (node.pos, "object is a type, not a value")
                 raise util.Error([msg])
 
         # If symbol wasn't defined locally in any block of the function then check if is a global variable,
         # function, etc., and return it
-        elif node.name in self.module.symbols:
-            symbol = self.module.symbols[node.name]
+        if symbol is None:
+            symbol = self.module.symbols.get(node.name, None)
 
             # If it's a type, raises an error
             if isinstance(symbol, ast.Class) and types_not_allowed:
@@ -216,14 +253,31 @@ class Typer(object):
                      "If you already declared it, check whether it is in this scope."]
             raise util.Error([msg], hints=hints)
 
+    def derive_type(self, template_name, element_types):
+        """
+        Return the type derived from a template like list<T>, tuple<T1, T2>, etc. for the types of the elements of a
+        collection. Derived types are stored in the module by their names, thus the same template and element names
+        always return the same type object and it is only necessary to build the derivation once.
+        """
+        key = (template_name, tuple(tp.name for tp in element_types))
+        typ = self.derived_types_cache.get(key, None)
+        if typ is None:
+            typ = self.module.instance_type(ast.DerivedType(None, template_name, element_types),
+                                            translations=self.translations)
+            self.derived_types_cache[key] = typ
+        return typ
+
     def visit(self, node):
         """
         This is used for call the proper visit method for a node. If node, for instance, is an ast.String, then
         this method will call `visit_string` method to handle the node properly.
         """
-        fn_name = "visit_" + str(node.__class__.__name__).lower()
-        visit_node_fn = getattr(self, fn_name)
-        visit_node_fn(node)
+        node_class = node.__class__
+        visit_node_fn = self.visitors.get(node_class, None)
+        if visit_node_fn is None:
+            fn_name = "visit_" + node_class.__name__.lower()
+            visit_node_fn = self.visitors[node_class] = getattr(self.__class__, fn_name)
+        visit_node_fn(self, node)
 
     # Node visitation methods
 
@@ -231,10 +285,16 @@ class Typer(object):
         """
         Start the analysis.
         """
+
+        # Functions already typed (for instance, when requested by a later pass of another module) are skipped before
+        # anything else, as their previous passes were necessarily done too
+        if PASS_NAME in fn.passes:
+            return
+
         util.check_previous_pass(self.module, fn, PASS_NAME)
-        if PASS_NAME not in fn.passes and types.is_concrete(fn, True):
+        if types.is_concrete(fn, True):
             self.fn = fn
-            self.definitions = util.ScopesDict()
+            self.definitions = util.FlatScopesDict()
 
             # Set the module to translate types based on these 'type_vars'
             translations = {}
@@ -246,58 +306,60 @@ class Typer(object):
             # Add arguments to function's scope
             for arg in fn.args:
                 self.define_variable(arg)
+            self.fn_arg_names = frozenset(arg.get_name() for arg in fn.args)
 
             # Visit the function blocks to typing its arguments and internal variables
-            for block in sorted(self.fn.flow.blocks, key=lambda blk: blk.id):
-                for step in sorted(block.steps, key=lambda stp: stp.id):
+            for block in self.fn.flow.ordered_blocks():
+                for step in block.steps:
                     self.visit(step)
 
-        self.fn.passes.append(PASS_NAME)
+            # Templates are never marked as typed, as the functions derived from them are copies which carry their
+            # passes
+            fn.passes.append(PASS_NAME)
 
     def visit_beginscope(self, node):
 
-        # Create a scope object for variable definitions; this is crucial for find a local variable's name in
+        # Open a new scope for variable definitions; this is crucial for find a local variable's name in
         # the scopes of a function
-        self.definitions = util.ScopesDict(self.definitions)
+        self.definitions.begin_scope()
 
         return node
 
     def visit_endscope(self, node):
-        self.definitions = self.definitions.parent
+        self.definitions.end_scope()
         return node
 
     # Basic types
 
     def visit_noneval(self, node):
-        node.type = self.module.instance_type("anytype")
+        node.type = self.any_type
 
     def visit_bool(self, node):
-        node.type = self.module.instance_type("bool")
+        node.type = self.bool_type
 
     def visit_int(self, node):
         # First set a temporary and generic integer type. Only after `specialize` pass it will get a definitive type
         # like i8, 32, etc.
-        node.type = self.module.instance_type("anyint")
+        node.type = self.anyint_type
 
     def visit_float(self, node):
         # First set a temporary and generic float type. Only after `specialize` pass it will get a definitive type
         # like i8, 32, etc.
-        node.type = self.module.instance_type("anyfloat")
+        node.type = self.anyfloat_type
 
     def visit_byte(self, node):
-        node.type = self.module.instance_type("byte")
+        node.type = self.byte_type
 
     # Structures
 
     def visit_array(self, node):
         self.visit(node.num_elements)
         node.target_type = self.module.instance_type(node.target_type, translations=self.translations)
-        node.type = types.Wrapper(self.module.instance_type(
-            ast.DerivedType(None, "array", [node.target_type]), translations=self.translations))
+        node.type = types.Wrapper(self.derive_type("array", [node.target_type]))
 
     def visit_string(self, node):
         # All strings should be set to str
-        node.type = types.Wrapper(self.module.instance_type("str"))
+        node.type = types.Wrapper(self.str_type)
 
     def visit_tuple(self, node):
         if len(node.elements) > types.MAX_TUPLE_ELEMENTS:
@@ -307,8 +369,7 @@ class Typer(object):
 
         for element in node.elements:
             self.visit(element)
-        node.type = types.Wrapper(self.module.instance_type(
-            ast.DerivedType(None, "tuple", [types.unwrap(element.type) for element in node.elements]), translations=self.translations))
+        node.type = types.Wrapper(self.derive_type("tuple", [types.unwrap(element.type) for element in node.elements]))
 
     def get_biggest_element_type(self, elements):
 
@@ -323,6 +384,11 @@ class Typer(object):
                 if biggest_element_type is None:
                     biggest_element_type = element.type
 
+                # Elements with the very same type as the biggest one (as all literals of a homogeneous collection) are
+                # surely compatible and don't change it
+                if element.type is biggest_element_type:
+                    continue
+
                 if not types.is_compatible(element.type, biggest_element_type):
                     msg = (element.pos, "elements have mismatch types ('{type1}' vs '{type2}')"
                            .format(type1=biggest_element_type.name, type2=element.type.name))
@@ -332,29 +398,26 @@ class Typer(object):
                 else:
                     biggest_element_type = types.choose_bigger_type(biggest_element_type, element.type)
         else:
-            biggest_element_type = self.module.instance_type("anytype")
+            biggest_element_type = self.any_type
 
         return types.unwrap(biggest_element_type)
 
     def visit_list(self, node):
 
         # Set the type of list with the biggest type found
-        node.type = types.Wrapper(self.module.instance_type(
-            ast.DerivedType(None, "list", [self.get_biggest_element_type(node.elements)]), translations=self.translations))
+        node.type = types.Wrapper(self.derive_type("list", [self.get_biggest_element_type(node.elements)]))
 
     def visit_dict(self, node):
 
         # Set the type of dict with the biggest type found for keys and values
         key_type = self.get_biggest_element_type(node.elements.keys())
         value_type = self.get_biggest_element_type(node.elements.values())
-        node.type = types.Wrapper(self.module.instance_type(
-            ast.DerivedType(None, "dict", [key_type, value_type]), translations=self.translations))
+        node.type = types.Wrapper(self.derive_type("dict", [key_type, value_type]))
 
     def visit_set(self, node):
 
         # Set the type of set with the biggest type found
-        node.type = types.Wrapper(self.module.instance_type(
-            ast.DerivedType(None, "set", [self.get_biggest_element_type(node.elements)]), translations=self.translations))
+        node.type = types.Wrapper(self.derive_type("set", [self.get_biggest_element_type(node.elements)]))
 
     def visit_attribute(self, node):
         self.visit(node.obj)
@@ -363,8 +426,9 @@ class Typer(object):
         obj_type = types.unwrap(node.obj.type)
 
         # Set the type to that of the attribute in the class
-        if node.attribute in obj_type.attributes:
-            node.type = obj_type.attributes[node.attribute]["type"]
+        attribute = obj_type.attributes.get(node.attribute, None)
+        if attribute is not None:
+            node.type = attribute["type"]
         elif node.attribute in obj_type.methods:
             msg = (node.pos, "object is a method, not a value")
             raise util.Error([msg])
@@ -391,12 +455,14 @@ class Typer(object):
         # Get the collection type which element makes part
         obj_type = types.unwrap(node.obj.type)
 
-        # Set the type of the element
-        if obj_type.name.startswith("data<"):
+        # Set the type of the element according to the template from which the collection type was derived, ie.
+        # 'tuple' from 'tuple<T1, T2>'
+        template_name = obj_type.name.partition("<")[0]
+        if template_name == "data":
             node.type = types.unwrap(node.obj.type.over)
             node.type = types.check_wrapper(node.type)
 
-        elif obj_type.name.startswith("tuple<"):
+        elif template_name == "tuple":
             if not node.key.is_literal:
                 msg = (node.key.pos, "element index must be a literal integer less or equal to '{num_elements}'"
                        .format(num_elements=len(obj_type.elements)-1))
@@ -405,10 +471,12 @@ class Typer(object):
 
         else:
 
-            if "__getitem__" in obj_type.methods:
-                call_fn = obj_type.methods["__getitem__"][0]
+            methods = obj_type.methods
+            get_item_methods = methods.get("__getitem__", None)
+            if get_item_methods is not None:
+                call_fn = get_item_methods[0]
                 node.type = call_fn.type.over["ret"]
-            elif check_set_item and "__setitem__" not in obj_type.methods:
+            elif check_set_item and "__setitem__" not in methods:
                 msg = (node.pos, "object has no method '__setitem__'")
                 hints = ["Are you sure that this object is a collection (like list, tuple, etc.)?",
                          "Implement a magic method '__setitem__' in '{type}'.".format(type=obj_type.name)]
@@ -427,7 +495,7 @@ class Typer(object):
 
     def visit_not(self, node):
         self.visit(node.value)
-        node.type = self.module.instance_type("bool")
+        node.type = self.bool_type
 
     def boolean(self, node):
         self.visit(node.left)
@@ -435,28 +503,25 @@ class Typer(object):
         if node.left.type == node.right.type:
             node.type = node.left.type
         else:
-            node.type = self.module.instance_type("bool")
-
-    def visit_and(self, node):
-        self.boolean(node)
+            node.type = self.bool_type
 
-    def visit_or(self, node):
-        self.boolean(node)
+    visit_and = visit_or = boolean
 
     # Comparison operators
 
     def visit_is(self, node):
         self.visit(node.left)
         self.visit(node.right)
-        node.type = self.module.instance_type("bool")
+        node.type = self.bool_type
 
     def compare(self, node):
         self.visit(node.left)
         self.visit(node.right)
 
+        # Operands of the very same type, the most common case, are compatible without further checking
         left_type, right_type = types.unwrap(node.left.type), types.unwrap(node.right.type)
-        if types.is_compatible(right_type, left_type):
-            node.type = self.module.instance_type("bool")
+        if left_type is right_type or types.is_compatible(right_type, left_type):
+            node.type = self.bool_type
         else:
             msg = (node.pos, "logical operation '{op}' with types '{left_type}' and '{right_type}' cannot be performed"
                    .format(op=node.op, left_type=node.left.type.name, right_type=node.right.type.name))
@@ -464,23 +529,8 @@ class Typer(object):
                      "Create a magic method to convert implicitly the values."]
             raise util.Error([msg], hints=hints)
 
-    def visit_equal(self, node):
-        self.compare(node)
-
-    def visit_notequal(self, node):
-        self.compare(node)
-
-    def visit_lowerthan(self, node):
-        self.compare(node)
-
-    def visit_lowerequal(self, node):
-        self.compare(node)
-
-    def visit_greaterthan(self, node):
-        self.compare(node)
-
-    def visit_greaterequal(self, node):
-        self.compare(node)
+    visit_equal = visit_notequal = compare
+    visit_lowerthan = visit_lowerequal = visit_greaterthan = visit_greaterequal = compare
 
     # Arithmetic operators
 
@@ -488,10 +538,10 @@ class Typer(object):
         self.visit(node.left)
         self.visit(node.right)
 
+        # Operands of the very same type, the most common case, are compatible without further checking
         left_type, right_type = types.unwrap(node.left.type), types.unwrap(node.right.type)
-        if types.is_compatible(right_type, left_type):
-            numeric_types = types.INTEGERS | types.FLOATS
-            if left_type in numeric_types and right_type in numeric_types and util.AUTOMATIC_CASTING:
+        if left_type is right_type or types.is_compatible(right_type, left_type):
+            if left_type in types.NUMERICS and right_type in types.NUMERICS and util.AUTOMATIC_CASTING:
                 node.type = types.choose_bigger_type(left_type, right_type)
             else:
                 node.type = node.left.type
@@ -506,8 +556,7 @@ class Typer(object):
     def visit_neg(self, node):
         self.visit(node.value)
 
-        numeric_types = types.INTEGERS | types.FLOATS
-        if node.value.type in numeric_types:
+        if node.value.type in types.NUMERICS:
             node.type = node.value.type
         else:
             msg = (node.pos, "arithmetic operation '{op}' with type '{type}' cannot be performed"
@@ -516,26 +565,7 @@ class Typer(object):
                      "Create a magic method to convert implicitly the values."]
             raise util.Error([msg], hints=hints)
 
-    def visit_add(self, node):
-        self.arith(node)
-
-    def visit_sub(self, node):
-        self.arith(node)
-
-    def visit_mul(self, node):
-        self.arith(node)
-
-    def visit_div(self, node):
-        self.arith(node)
-
-    def visit_mod(self, node):
-        self.arith(node)
-
-    def visit_floordiv(self, node):
-        self.arith(node)
-
-    def visit_pow(self, node):
-        self.arith(node)
+    visit_add = visit_sub = visit_mul = visit_div = visit_mod = visit_floordiv = visit_pow = arith
 
     # Bitwise operators
 
@@ -569,20 +599,7 @@ class Typer(object):
                      "Create a magic method to convert implicitly the values."]
             raise util.Error([msg], hints=hints)
 
-    def visit_bwand(self, node):
-        self.bitwise(node)
-
-    def visit_bwor(self, node):
-        self.bitwise(node)
-
-    def visit_bwxor(self, node):
-        self.bitwise(node)
-
-    def visit_bwshiftleft(self, node):
-        self.bitwise(node)
-
-    def visit_bwshiftright(self, node):
-        self.bitwise(node)
+    visit_bwand = visit_bwor = visit_bwxor = visit_bwshiftleft = visit_bwshiftright = bitwise
 
     # Control flow
 
@@ -614,8 +631,7 @@ class Typer(object):
             else:
                 left_type, right_type = types.unwrap(left.type), types.unwrap(right.type)
                 if types.is_compatible(right_type, left_type):
-                    numeric_types = types.INTEGERS | types.FLOATS
-                    if left_type in numeric_types and right_type in numeric_types and util.AUTOMATIC_CASTING:
+                    if left_type in types.NUMERICS and right_type in types.NUMERICS and util.AUTOMATIC_CASTING:
                         node.type = types.choose_bigger_type(left_type, right_type)
                     else:
                         node.type = left.type
@@ -730,8 +746,8 @@ class Typer(object):
 
             # Insert the object as 'self' argument
             if obj_type is not None:
-                node.args.insert(0, obj)
-                positional.insert(0, obj.type)
+                node.args = [obj, *node.args]
+                positional = [obj.type, *positional]
 
         # Calling a type constructor:
         #     res = Class()
@@ -740,8 +756,7 @@ class Typer(object):
             # Insert '$parent_self' argument in method generator
             is_method_as_generator = "." in node.callable_object.name
             if is_method_as_generator:
-                parent_self_types = list(obj_type.type_vars.values())  # Include $parent_self derivation types
-                derivation_types = derivation_types + parent_self_types
+                derivation_types = [*derivation_types, *obj_type.type_vars.values()]  # Include $parent_self types
                 node.args.append(obj)
                 positional.append(obj.type)
 
@@ -751,8 +766,8 @@ class Typer(object):
             # Insert `self` as the first argument
             node.type = types.Wrapper(node.fn.self_type)
             if node.fn.name == "__init__":
-                node.args.insert(0, ast.Init(node.type))
-                positional.insert(0, node.type)
+                node.args = [ast.Init(node.type), *node.args]
+                positional = [node.type, *positional]
 
         # Calling a function hold by a variable or attribute:
         #     var function = other_function
@@ -768,32 +783,35 @@ class Typer(object):
         # Traverse formal arguments of the function to check if some argument is missing in the call
         # Whether a formal argument is missing check if the formal argument has a default value to use it as
         # replacement
-        names = {}
         if hasattr(node.fn, "args"):
+
+            # Rebuild arguments by keeping the positional ones in front and then placing every remaining formal
+            # argument in its declared order, taking the value either from the named arguments or from the default
+            new_args, named_values = [], {}
+            for arg in node.args:
+                if isinstance(arg, ast.NamedArg):
+                    named_values[arg.name] = arg.value
+                else:
+                    new_args.append(arg)
+
+            formal_args = node.fn.args
             missing_args = []
-            for arg_pos, formal_arg in enumerate(node.fn.args):
-                if arg_pos > (len(positional) - 1) and formal_arg.name not in named:
-                    if formal_arg.default_value is None:
-                        missing_args.append(formal_arg)
-                    else:
-                        self.visit(formal_arg.default_value)
-                        names[formal_arg.name] = formal_arg.default_value
+            for i in range(len(positional), len(formal_args)):
+                formal_arg = formal_args[i]
+                if formal_arg.name in named_values:
+                    new_args.append(named_values[formal_arg.name])
+                elif formal_arg.default_value is None:
+                    missing_args.append(formal_arg)
+                else:
+                    self.visit(formal_arg.default_value)
+                    new_args.append(formal_arg.default_value)
 
             if len(missing_args) > 0:
                 msg = (node.fn.pos, "function was declared with these arguments")
                 msg2 = (node.pos, "but the call is missing the '{args}' argument(s)"
-                        .format(args=", ".join("{arg}".format(arg=arg.name) for arg in missing_args)))
+                        .format(args=", ".join(arg.name for arg in missing_args)))
                 raise util.Error([msg, msg2])
 
-            # Rebuild arguments by putting named arguments in correct order
-            new_args = []
-            for arg in node.args:
-                if isinstance(arg, ast.NamedArg):
-                    names[arg.name] = arg.value
-                else:
-                    new_args.append(arg)
-            for arg in list(node.fn.args)[len(new_args):]:
-                new_args.append(names[arg.name])
             node.args = new_args
 
         # Check that the actual types match the function's formal types
@@ -833,7 +851,11 @@ class Typer(object):
 
         # Check if None as return is ok
         ret_type = self.fn.type.over["ret"]
-        if node.value is None and ret_type != self.module.instance_type("void"):
+        returns_void = ret_type == self.void_type
+        if node.value is None:
+            if returns_void:
+                return
+
             hints = []
             if node.pos is None:
                 msgs = [(self.fn.ret.pos, "function must return value of type '{type}' but no value was returned"
@@ -846,21 +868,18 @@ class Typer(object):
                 msgs = [msg, msg2]
             hints += ["Do not define a return type for the function."]
             raise util.Error(msgs, hints=hints)
-        elif node.value is not None and ret_type == self.module.instance_type("void"):
-            self.visit(node.value)
+
+        self.visit(node.value)
+
+        if returns_void:
             msg = (self.fn.pos, "function defined with no return")
             msg2 = (node.value.pos, "but is returning '{type}'".format(type=node.value.type.name))
             hints = ["Have you forget to define a return type for the function?"]
             raise util.Error([msg, msg2], hints=hints)
-        elif node.value is None:
-            return
-
-        self.visit(node.value)
 
         # TODO: Doesn't allow reference to a local variable be returned as the local variable will be freed after call
         # is finished
-        value_is_arg = isinstance(node.value, ast.Symbol) and \
-                       node.value.get_name() in [arg.get_name() for arg in self.fn.args]
+        value_is_arg = isinstance(node.value, ast.Symbol) and node.value.get_name() in self.fn_arg_names
         if types.is_reference(node.value.type) and not value_is_arg:
             msg = (node.value.pos, "cannot return a reference to a local object")
             raise util.Error([msg])
@@ -913,7 +932,7 @@ class Typer(object):
     def visit_assign(self, node):
 
         def check_void(right):
-            if isinstance(right, ast.Call) and right.type == self.module.instance_type("void"):
+            if isinstance(right, ast.Call) and right.type == self.void_type:
                 msg = (right.pos, "function returns nothing".format(type=right.type.name))
                 raise util.Error([msg])
 
@@ -927,10 +946,11 @@ class Typer(object):
                     self.define_variable(left)
                     left.type = right_type
                 else:
+                    # The symbol was just looked up, so its type is set directly instead of visiting it again
                     symbol = self.check_symbol_definition(left)
                     if symbol.type is None:
                         symbol.type = right_type
-                    self.visit(left)
+                    left.type = symbol.type
 
             elif isinstance(left, (flow.SetAttribute, flow.SetElement)):
 
@@ -956,8 +976,9 @@ class Typer(object):
 
         # Set the type for every element of the tuple
         if isinstance(node.left, ast.Tuple):
-            if types.unwrap(node.right.type).name.startswith("tuple<"):
-                num_right_elements = len(types.unwrap(node.right.type).elements)
+            right_type = types.unwrap(node.right.type)
+            if right_type.name.startswith("tuple<"):
+                num_right_elements = len(right_type.elements)
             else:
                 num_right_elements = 1
             num_left_elements = len(node.left.elements)
@@ -968,8 +989,9 @@ class Typer(object):
                 raise util.Error([msg])
 
             node.left.type = node.right.type
+            element_types = right_type.elements
             for i, element in enumerate(node.left.elements):
-                element_type = types.unwrap(node.left.type).elements[i]
+                element_type = element_types[i]
                 if isinstance(node.right, ast.Tuple):
                     check_void(node.right.elements[i])
                 set_left_type(element, element_type)
@@ -991,11 +1013,11 @@ class Typer(object):
         self.visit(node.obj)
         for i, typ in enumerate(node.types):
             node.types[i] = self.module.instance_type(typ, translations=self.translations)
-        node.type = self.module.instance_type("bool")
+        node.type = self.bool_type
 
     def visit_sizeof(self, node):
         node.target_type = self.module.instance_type(node.target_type, translations=self.translations)
-        node.type = self.module.instance_type("anyint")
+        node.type = self.anyint_type
 
     def visit_transmute(self, node):
         self.visit(node.obj)
@@ -1018,19 +1040,14 @@ class Typer(object):
         self.visit(node.num_elements)
         node.type = node.obj.type
 
-    def visit_copymemory(self, node):
+    def copy_or_move_memory(self, node):
         self.visit(node.src)
         self.check_data_pointer(node.src)
         self.visit(node.dst)
         self.check_data_pointer(node.dst)
         self.visit(node.num_elements)
 
-    def visit_movememory(self, node):
-        self.visit(node.src)
-        self.check_data_pointer(node.src)
-        self.visit(node.dst)
-        self.check_data_pointer(node.dst)
-        self.visit(node.num_elements)
+    visit_copymemory = visit_movememory = copy_or_move_memory
 
     def visit_reference(self, node):
         self.visit(node.value)
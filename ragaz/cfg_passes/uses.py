@@ -24,8 +24,24 @@ from ragaz.ast_passes import flow
 PASS_NAME = __name__.split(".")[-1]
 
 
+class ObjectReference(util.Repr):
+    """
+    A reference from an object to another one, made by 'reference_assign' and blocked by 'blocking_assign' when the
+    referenced object receives a new value.
+    """
+
+    def __init__(self, obj, reference_assign):
+        self.obj = obj
+        self.reference_assign = reference_assign
+        self.blocking_assign = None
+
+
 class UsesChecker(object):
 
+    # Visit methods indexed by the class of the node. It's filled as the classes are visited for the first time, thus
+    # the method name is built only once per class instead of once per node
+    visitors = {}
+
     def __init__(self, module):
         self.module = module
         self.fn = None
@@ -33,7 +49,9 @@ class UsesChecker(object):
         self.definitions = None
         self.uses = None
         self.moves = None
+        self.partial_moves = None
         self.references = None
+        self.references_by_obj = None
 
     def process(self):
 
@@ -42,51 +60,66 @@ class UsesChecker(object):
             self.visit_function(fn)
 
     def define_variable(self, var):
-        if var.get_name() not in self.definitions:
-            self.definitions[var.get_name()] = self.indent_level, var
+        name = var.get_name()
+        if name not in self.definitions:
+            self.definitions[name] = self.indent_level, var
         if var.name != "self" and (isinstance(var, ast.Symbol) and not var.is_hidden()):
-            self.uses[var.get_name()] = var, set()
+            self.uses[name] = var, set()
+
+    def set_moved(self, node):
+        name = node.get_name()
+        self.moves[name] = node
+
+        # Moved attributes are also indexed by their object's name, so a later move of the whole object finds them
+        # without scanning all moves
+        if isinstance(name, tuple):
+            self.partial_moves.setdefault(name[0], {})[name] = node
+
+    def unset_moved(self, name):
+        if self.moves.pop(name, None) is not None and isinstance(name, tuple):
+            del self.partial_moves[name[0]][name]
 
     def check_move_or_copy(self, src, dst_type):
 
         def check_partial_move(node):
             # Check if object had its ownership moved
-            var = self.moves.get(node.get_name(), None)
+            name = node.get_name()
+            var = self.moves.get(name, None)
             if var is None:
-                for obj in self.moves:
-                    if isinstance(obj, tuple) and obj[0] == node.get_name():
-                        var = self.moves[obj]
-                        msg = (var.pos, "value partially moved here")
-                        msg2 = (node.pos, "but passed again here after move")
-                        hints = ["If you don't intend move it, consider pass a reference to value using '&' operator."]
-                        raise util.Error([msg, msg2], hints=hints)
+                for var in self.partial_moves.get(name, {}).values():
+                    msg = (var.pos, "value partially moved here")
+                    msg2 = (node.pos, "but passed again here after move")
+                    hints = ["If you don't intend move it, consider pass a reference to value using '&' operator."]
+                    raise util.Error([msg, msg2], hints=hints)
 
         # If the object will be passed to a function which is imported from C language, the operations like 'move'
         # and 'copy' are not applicable
-        is_extern_c = False
-        if hasattr(src, "copy_or_move_call") and src.copy_or_move_call is not None:
-            is_extern_c = src.copy_or_move_call.fn.type.is_extern_c
+        call = src.copy_or_move_call
+        is_extern_c = call is not None and call.fn.type.is_extern_c
 
         # If object will be moved, render it inaccessible after now
         if not is_extern_c:
-            if hasattr(src, "check_move") and src.check_move:
+            if src.check_move:
                 if types.is_heap_owner(dst_type):
                     if isinstance(src, ast.Tuple):
                         for i, element in enumerate(src.elements):
                             if types.is_heap_owner(element.type):
                                 check_partial_move(element)
-                                self.moves[element.get_name()] = element
+                                self.set_moved(element)
                     elif isinstance(src, (ast.Symbol, ast.Attribute)):
                         check_partial_move(src)
-                        self.moves[src.get_name()] = src
-            elif hasattr(src, "check_copy") and src.check_copy:
+                        self.set_moved(src)
+            elif src.check_copy:
                 if not types.is_heap_owner(src.type):
                     src.check_copy = False
         else:
-            if hasattr(src, "check_move"):
-                src.check_move = False
-            elif hasattr(src, "check_copy"):
-                src.check_copy = False
+            self.clear_move_or_copy(src)
+
+    def clear_move_or_copy(self, node):
+        if node.check_move:
+            node.check_move = False
+        elif node.check_copy:
+            node.check_copy = False
 
     def visit(self, node):
         """
@@ -96,37 +129,46 @@ class UsesChecker(object):
         if node is None:
             return
 
-        # Call the "visit" function of the node if it exists
-        fn_name = "visit_" + str(node.__class__.__name__).lower()
-        if hasattr(self, fn_name):
-            visit_node_fn = getattr(self, fn_name)
-            visit_node_fn(node)
+        # Call the "visit" function of the node if it exists, otherwise the node has nothing to check, like a 'pass'
+        node_class = node.__class__
+        visit_node_fn = self.visitors.get(node_class, None)
+        if visit_node_fn is None:
+            fn_name = "visit_" + node_class.__name__.lower()
+            visit_node_fn = self.visitors[node_class] = getattr(self.__class__, fn_name, UsesChecker.visit_pass)
+        visit_node_fn(self, node)
 
     def visit_function(self, fn):
         """
         Start the analysis.
         """
+
+        # Functions already checked (for instance, when requested by a later pass of another module) are skipped
+        # before anything else, as their previous passes were necessarily done too
+        if PASS_NAME in fn.passes:
+            return
+
         util.check_previous_pass(self.module, fn, PASS_NAME)
-        if PASS_NAME not in fn.passes and types.is_concrete(fn):
+        if types.is_concrete(fn):
             self.fn = fn
             self.indent_level = -1
-            self.definitions = util.ScopesDict()
+            self.definitions = util.FlatScopesDict()
             self.uses = {}
             self.moves = {}
+            self.partial_moves = {}
             self.references = {}
+            self.references_by_obj = {}
 
             # Add arguments to function's scope
             for arg in self.fn.args:
                 self.define_variable(arg)
 
             # Check where names were assigned and where were used
-            for block in sorted(self.fn.flow.blocks, key=lambda blk: blk.id):
-                for step in sorted(block.steps, key=lambda stp: stp.id):
+            for block in self.fn.flow.ordered_blocks():
+                for step in block.steps:
                     self.visit(step)
 
             # Check which variables are unused
-            for name in self.uses:
-                var, uses = self.uses[name]
+            for var, uses in self.uses.values():
                 if len(uses) == 0:
                     msg = (var.pos, "this variable is unused")
                     util.warn([msg])
@@ -135,11 +177,11 @@ class UsesChecker(object):
         fn.passes.append(PASS_NAME)
 
     def visit_beginscope(self, node):
-        self.definitions = util.ScopesDict(self.definitions)
+        self.definitions.begin_scope()
         self.indent_level += 1
 
     def visit_endscope(self, node):
-        self.definitions = self.definitions.parent
+        self.definitions.end_scope()
         self.indent_level -= 1
         return node
 
@@ -186,9 +228,13 @@ class UsesChecker(object):
             self.visit(element)
 
     def visit_attribute(self, node):
-        if isinstance(node.obj, ast.Symbol):
-            self.check_object(node)
-        self.visit(node.obj)
+
+        # Walk down a chain of attributes like 'a.b.c' in a loop rather than visiting each one recursively
+        while isinstance(node, ast.Attribute):
+            if isinstance(node.obj, ast.Symbol):
+                self.check_object(node)
+            node = node.obj
+        self.visit(node)
 
     def visit_setattribute(self, node):
         self.visit_attribute(node)
@@ -209,11 +255,7 @@ class UsesChecker(object):
         self.visit(node.left)
         self.visit(node.right)
 
-    def visit_and(self, node):
-        self.boolean(node)
-
-    def visit_or(self, node):
-        self.boolean(node)
+    visit_and = visit_or = boolean
 
     # Comparison operators
 
@@ -224,23 +266,8 @@ class UsesChecker(object):
         self.visit(node.left)
         self.visit(node.right)
 
-    def visit_equal(self, node):
-        self.compare(node)
-
-    def visit_notequal(self, node):
-        self.compare(node)
-
-    def visit_lowerthan(self, node):
-        self.compare(node)
-
-    def visit_lowerequal(self, node):
-        self.compare(node)
-
-    def visit_greaterthan(self, node):
-        self.compare(node)
-
-    def visit_greaterequal(self, node):
-        self.compare(node)
+    visit_equal = visit_notequal = compare
+    visit_lowerthan = visit_lowerequal = visit_greaterthan = visit_greaterequal = compare
 
     # Arithmetic operators
 
@@ -251,26 +278,7 @@ class UsesChecker(object):
     def visit_neg(self, node):
         self.visit(node.value)
 
-    def visit_add(self, node):
-        self.arith(node)
-
-    def visit_sub(self, node):
-        self.arith(node)
-
-    def visit_mod(self, node):
-        self.arith(node)
-
-    def visit_mul(self, node):
-        self.arith(node)
-
-    def visit_div(self, node):
-        self.arith(node)
-
-    def visit_floordiv(self, node):
-        self.arith(node)
-
-    def visit_pow(self, node):
-        self.arith(node)
+    visit_add = visit_sub = visit_mul = visit_div = visit_mod = visit_floordiv = visit_pow = arith
 
     # Bitwise operators
 
@@ -281,20 +289,7 @@ class UsesChecker(object):
     def visit_bwnot(self, node):
         self.visit(node.value)
 
-    def visit_bwand(self, node):
-        self.bitwise(node)
-
-    def visit_bwor(self, node):
-        self.bitwise(node)
-
-    def visit_bwxor(self, node):
-        self.bitwise(node)
-
-    def visit_bwshiftleft(self, node):
-        self.bitwise(node)
-
-    def visit_bwshiftright(self, node):
-        self.bitwise(node)
+    visit_bwand = visit_bwor = visit_bwxor = visit_bwshiftleft = visit_bwshiftright = bitwise
 
     # Control flow
 
@@ -323,10 +318,17 @@ class UsesChecker(object):
     def visit_call(self, node):
         self.visit(node.callable)
 
+        # Arguments passed to a function which is imported from C language are neither moved nor copied, thus
+        # there is nothing to check for them
         formals = node.fn.type.over["args"]
-        for actual, formal_type in zip(node.args, formals):
-            self.visit(actual)
-            self.check_move_or_copy(actual, formal_type)
+        if node.fn.type.is_extern_c:
+            for actual, formal_type in zip(node.args, formals):
+                self.visit(actual)
+                self.clear_move_or_copy(actual)
+        else:
+            for actual, formal_type in zip(node.args, formals):
+                self.visit(actual)
+                self.check_move_or_copy(actual, formal_type)
 
     def visit_yield(self, node):
         self.visit(node.value)
@@ -337,9 +339,10 @@ class UsesChecker(object):
     # Symbols
 
     def check_object(self, node):
+        name = node.get_name()
 
         # Check if variable had its ownership moved
-        var = self.moves.get(node.get_name(), None)
+        var = self.moves.get(name, None)
         if var is not None:
             msg = (var.pos, "value moved here")
             msg2 = (node.pos, "but used here after move")
@@ -347,23 +350,23 @@ class UsesChecker(object):
             raise util.Error([msg, msg2], hints=hints)
 
         # Check if object is being used after the referenced object received new value
-        for _, references in self.references.items():
-            for i in range(len(references)):
-                reference_assign = references[i]["reference_assign"]
-                blocking_assign = references[i]["blocking_assign"]
-                if references[i]["obj"].get_name() == node.get_name() and blocking_assign is not None:
-                    _, var = self.definitions[blocking_assign.left.get_name()]
-                    msg = (reference_assign.right.pos, "when an object is referenced".format(var=var.name))
-                    msg2 = (blocking_assign.left.pos, "but new assignment to it happens".format(var=var.name))
-                    msg3 = (node.pos, "the reference cannot be used later")
-                    raise util.Error([msg, msg2, msg3])
+        for reference in self.references_by_obj.get(name, []):
+            reference_assign = reference.reference_assign
+            blocking_assign = reference.blocking_assign
+            if blocking_assign is not None:
+                _, var = self.definitions[blocking_assign.left.get_name()]
+                msg = (reference_assign.right.pos, "when an object is referenced".format(var=var.name))
+                msg2 = (blocking_assign.left.pos, "but new assignment to it happens".format(var=var.name))
+                msg3 = (node.pos, "the reference cannot be used later")
+                raise util.Error([msg, msg2, msg3])
 
     def visit_symbol(self, node):
         self.check_object(node)
 
         # Check if variable is used and increments the counter
-        if node.get_name() in self.uses:
-            var, uses = self.uses[node.get_name()]
+        name = node.get_name()
+        if name in self.uses:
+            var, uses = self.uses[name]
             uses.add(node)
 
     def visit_namedarg(self, node):
@@ -384,11 +387,11 @@ class UsesChecker(object):
 
         def check_object_blockings(left):
             def block_references(obj):
-                if obj.get_name() in self.references:
-                    references = self.references[obj.get_name()]
+                references = self.references.get(obj.get_name(), None)
+                if references is not None:
                     for i in range(len(references)):
-                        references[i]["blocking_assign"] = node
-                        block_references(references[i]["obj"])
+                        references[i].blocking_assign = node
+                        block_references(references[i].obj)
 
             # Block any variable which references the variable to be used from this point
             # This is important to avoid references to freed memory
@@ -396,15 +399,15 @@ class UsesChecker(object):
 
             # Once variable is owning a new value, from this place doesn't make sense keep checking if the
             # variable was moved earlier
-            if left.get_name() in self.moves:
-                del self.moves[left.get_name()]
+            self.unset_moved(left.get_name())
 
         def check_reference(left, right):
+            left_name, right_name = left.get_name(), right.get_name()
 
             # Checks if an object is being referenced by more than one mutable object
             if left.type.is_mutable:
-                for previous_reference in self.references.get(right.get_name(), []):
-                    obj = previous_reference["obj"]
+                for previous_reference in self.references.get(right_name, []):
+                    obj = previous_reference.obj
                     if obj.type.is_mutable:
                         msg = (obj.pos, "mutable object '{previous}' already references the same object".
                                format(previous=obj.name))
@@ -413,17 +416,17 @@ class UsesChecker(object):
                         hints = ["Consider remove the mutability of one of them or both."]
                         raise util.Error([msg, msg2], hints=hints)
 
-            # Add the left object as being more one reference to the right object
-            self.references.setdefault(right.get_name(), [])
-            self.references[right.get_name()].append({"obj": left,
-                                                      "reference_assign": node,
-                                                      "blocking_assign": None})
+            # Add the left object as being more one reference to the right object. The same entry is also indexed by
+            # the left object's name, so that a use of the object finds its references without scanning all of them
+            reference = ObjectReference(left, node)
+            self.references.setdefault(right_name, []).append(reference)
+            self.references_by_obj.setdefault(left_name, []).append(reference)
 
             # Check if a value which goes out of scope is referenced by an object
             # Obviously, this is only valid for local variables, not attributes
-            if left.get_name() in self.definitions and right.get_name() in self.definitions:
-                value_indent_level, value = self.definitions[right.get_name()]
-                var_indent_level, left = self.definitions[left.get_name()]
+            if left_name in self.definitions and right_name in self.definitions:
+                value_indent_level, value = self.definitions[right_name]
+                var_indent_level, left = self.definitions[left_name]
                 if value_indent_level > var_indent_level:
                     msg = (left.pos, "object '{left}' defined in outer scope".format(left=left.name))
                     msg2 = (right.pos, "cannot reference object '{right}' defined in inner scope".format(right=value.name))
@@ -467,7 +470,7 @@ class UsesChecker(object):
 
     def visit_del(self, node):
         self.visit(node.obj)
-        self.moves[node.obj.get_name()] = node.obj
+        self.set_moved(node.obj)
 
     def visit_reallocmemory(self, node):
         self.visit(node.obj)
@@ -2,6 +2,11 @@ import llvmlite.binding as llvm
 import os
 import subprocess
 import collections
+import hashlib
+import pickle
+import rply
+import sys
+import tempfile
 from ragaz import ast_ as ast, parser, module as module_, util
 from ragaz.ast_passes import expressions, implicits, flow
 from ragaz.cfg_passes import uses, typing, specialization, escapes, destructions, \
@@ -36,6 +41,23 @@ TARGET_MACHINE = target.create_target_machine(jit=False)
 CORE_MODULE = None
 
 
+def get_user_cache_dir():
+    """
+    Return the directory where the current user's caches of the compiler are kept (it isn't created here).
+    """
+    if os.name == "nt":
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "ragaz")
+
+
+# File where the AST of the CORE module is cached between compilations. It's kept in a per-user directory (and not in
+# the installation's one) because a pickle is loaded from it. Set `RAGAZ_NO_CORE_CACHE` in the environment to always
+# parse the CORE module from its source
+CORE_AST_CACHE_FILE = os.path.join(get_user_cache_dir(), "__builtins__.zzc")
+
+
 def create_module(file, is_core=False):
     """
     Takes a file, returns a Module containing declarations and code objects, to be submitted for further processing.
@@ -48,8 +70,10 @@ def create_module(file, is_core=False):
     # Parse the file and get the root node of the AST (abstract syntax tree)
     with open(file) as f:
         src = f.read() + "\n"
-        state = parser.State(file, src)
-    root_node = parser.parse(src, state)
+    if is_core and "RAGAZ_NO_CORE_CACHE" not in os.environ:
+        root_node = parse_core_file(file, src)
+    else:
+        root_node = parser.parse(src, parser.State(file, src))
 
     # Create the module from AST tree
     builtin_module = CORE_MODULE if not is_core else None
@@ -58,19 +82,68 @@ def create_module(file, is_core=False):
     return module
 
 
+def parse_core_file(file, src):
+    """
+    Parsing the CORE module is a large part of the time spent compiling small programs, so its AST is pickled to a
+    cache file and reused while neither its source nor what builds the AST (lexer, grammar and nodes) change.
+    """
+
+    # Identify the cache by the file's path (which is part of the nodes' positions) and all sources involved. The lexer
+    # and the grammar are defined in the parser module but generated by `rply`, thus its version is included too; and
+    # also the Python's one, which defines the pickle protocol
+    key = hashlib.sha1(file.encode())
+    key.update(src.encode())
+    for source_file in (parser.__file__, ast.__file__, util.__file__):
+        with open(source_file, "rb") as f:
+            key.update(f.read())
+    key.update(rply.__version__.encode())
+    key.update(sys.version.encode())
+    key = key.hexdigest().encode()
+
+    # The key is written in the first line of the cache and the AST is only unpickled if the key matches; so a cache
+    # written by another version (whose nodes could fail to load) is never unpickled. A missing, stale or corrupt
+    # cache is just rebuilt
+    try:
+        with open(CORE_AST_CACHE_FILE, "rb") as f:
+            if f.readline().rstrip(b"\n") == key:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+
+    root_node = parser.parse(src, parser.State(file, src))
+
+    # The cache is written to a temporary file which then replaces the old one at once, so that concurrent compilations
+    # never read a half-written cache. It's only an optimization, thus failing to write it is ignored
+    cache_dir = os.path.dirname(CORE_AST_CACHE_FILE)
+    temp_file = None
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(key + b"\n")
+            pickle.dump(root_node, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, CORE_AST_CACHE_FILE)
+    except OSError:
+        if temp_file is not None and os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    return root_node
+
+
 def process_file(input_file, last_pass=None):
 
     def get_module(file, is_core=False, is_main_file=False):
 
         def import_object(obj_module, obj_pos, obj_original_name, obj_name, obj_node):
 
-            for obj in objects_to_import:
-                if obj["module"].file == obj_module.file and obj["original_name"] == obj_original_name:
-                    msg = (obj["pos"], "object named '{name}' was imported here".format(name=obj_original_name))
-                    msg2 = (obj_pos, "but was imported again here")
-                    raise util.Error([msg, msg2])
+            # Check if the object was already imported, by looking up the position where it was imported first
+            key = (obj_module.file, obj_original_name)
+            if key in objects_to_import:
+                msg = (objects_to_import[key], "object named '{name}' was imported here".format(name=obj_original_name))
+                msg2 = (obj_pos, "but was imported again here")
+                raise util.Error([msg, msg2])
 
-            objects_to_import.append({"module": obj_module, "pos": obj_pos, "original_name": obj_original_name})
+            objects_to_import[key] = obj_pos
             if isinstance(obj_node, (ast.Class, ast.Trait)) or \
                (isinstance(obj_node, ast.Function) and isinstance(obj_node.ret, ast.DerivedType) and obj_node.ret.name == "iterator"):
                 module.types.imported_modules.setdefault(obj_module.types, []).append([obj_name, obj_original_name])
@@ -80,6 +153,13 @@ def process_file(input_file, last_pass=None):
         def process_importation(node, module_path):
 
             def get_module_file(path):
+
+                # The same paths are looked up by every module importing them (and by the search for submodules),
+                # thus the file found for a path in a root directory is kept to avoid checking the file system again
+                key = (root_dir, tuple(path))
+                if key in module_files:
+                    return module_files[key]
+
                 file = None
                 include_dirs = [root_dir, util.STANDARD_LIB_DIR]
                 for dir in include_dirs:
@@ -90,6 +170,7 @@ def process_file(input_file, last_pass=None):
                     elif os.path.isfile(os.path.join(dir, "__init__.zz")):
                         file = os.path.join(dir, "__init__.zz")
                         break
+                module_files[key] = file
                 return file
 
             # Check if the file exists
@@ -169,7 +250,7 @@ def process_file(input_file, last_pass=None):
         # Create the module if it doesn't exist
         if file not in modules:
 
-            objects_to_import = []
+            objects_to_import = {}
             root_dir = os.path.dirname(file)
             module = create_module(file, is_core=is_core)
             modules[file] = module
@@ -193,6 +274,7 @@ def process_file(input_file, last_pass=None):
         return module
 
     modules = {}
+    module_files = {}
     dependencies = {}
     ordered_modules = collections.OrderedDict()
 
@@ -206,25 +288,24 @@ def process_file(input_file, last_pass=None):
     # Create the main module
     module = get_module(input_file, is_main_file=True)
 
-    # Traverse all module dependencies to create an ordered list of modules to process
-    remains = set(dependencies)
-    while len(remains) > 0:
-
-        # Write out modules with no dependencies
-        done = set()
-        for file in remains:
-            if len(dependencies[file]) == 0:
-                ordered_modules[file] = modules[file]
-                done.add(file)
-
-        # Remove the processed modules from dependency lists
-        remains -= {file for file in done}
-        for remain_file in remains:
-            for done_file in done:
-                if done_file in dependencies[remain_file]:
-                    dependencies[remain_file].remove(done_file)
-
-        assert len(done) > 0, len(remains) > 0  # check that we made progress
+    # Traverse all module dependencies to create an ordered list of modules to process (Kahn's algorithm): a module is
+    # written out as soon as all modules it depends on were written out, which is tracked by counting its remaining
+    # dependencies instead of rescanning all of them
+    num_dependencies = {file: len(dependency_files) for file, dependency_files in dependencies.items()}
+    dependents = {file: [] for file in dependencies}
+    for file, dependency_files in dependencies.items():
+        for dependency_file in dependency_files:
+            dependents[dependency_file].append(file)
+    ready = collections.deque(file for file, num in num_dependencies.items() if num == 0)
+    while len(ready) > 0:
+        file = ready.popleft()
+        ordered_modules[file] = modules[file]
+        for dependent_file in dependents[file]:
+            num_dependencies[dependent_file] -= 1
+            if num_dependencies[dependent_file] == 0:
+                ready.append(dependent_file)
+
+    assert len(ordered_modules) == len(modules)  # check that there are no circular dependencies
 
     # Execute the passes in the AST and CFG trees of the module
     for pass_name, ProcessorClass in PASSES.items():
@@ -289,19 +370,21 @@ def compile(input_file, output_file, output_is_library=False, use_optimization=T
     modules = process_file(input_file)
 
     # Prepare a dict to store LLVM assembly files and their content
-    core_ir_file = os.path.join(util.CORE_DIR, "__builtins__.ll")
-    ir_files = {core_ir_file: str(CORE_MODULE.ir)}
+    # The CORE module is only processed in the first compilation, thus in the next ones its IR is just saved again
+    ir_files = {}
+    if CORE_MODULE.file not in modules:
+        core_ir_file = os.path.join(util.CORE_DIR, "__builtins__.ll")
+        ir_files[core_ir_file] = str(CORE_MODULE.ir)
 
     # Generate a string of LLVM assembly for every imported module in input file
     for file, module in modules.items():
-        code_generation.generate_module_ir(TARGET_MACHINE, module)
         module_ir_file = file.rsplit(".zz")[0] + ".ll"
-        ir_files[module_ir_file] = module.ir
+        ir_files[module_ir_file] = code_generation.generate_module_ir(TARGET_MACHINE, module)
 
     # Save all LLVM assembly files
     for file, ir in ir_files.items():
         with open(file, "w") as f:
-            f.write(str(ir))
+            f.write(ir)
 
     triple = TARGET_MACHINE.triple
     clang_compiler = find_clang()
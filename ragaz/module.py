@@ -181,7 +181,7 @@ class Module(object):
 
         # Void
         if typ is None:
-            typ = self.instance_type("void")
+            typ = self.types["void"]
 
         # Variadic arguments
         elif isinstance(typ, ast.VariadicArgs):
@@ -51,6 +51,7 @@ SIGNED_INTEGERS = set()
 UNSIGNED_INTEGERS = set()
 INTEGERS = set()
 FLOATS = set()
+NUMERICS = set()  # Union of INTEGERS and FLOATS
 
 VOID_FUNCTIONS = {"__init__", "__del__"}
 
@@ -69,7 +70,7 @@ def is_heap_owner(typ):
     """
     Check if type is about ownership to data allocated in the heap memory
     """
-    return hasattr(typ, "is_heap_owner") and typ.is_heap_owner
+    return getattr(typ, "is_heap_owner", False)
 
 
 def is_reference(typ):
@@ -88,6 +89,16 @@ def unwrap(typ):
     return typ
 
 
+def peel(typ):
+    """
+    Returns both the class of the container wrapping the type (or None if the type isn't wrapped) and the actual type
+    that is wrapped inside it
+    """
+    if isinstance(typ, Wrapper):
+        return typ.__class__, unwrap(typ.over)
+    return None, typ
+
+
 def check_wrapper(typ):
     """
     Different from basic types like int, float, etc. which the VALUE is passed into a variable, when a variable
@@ -157,7 +168,10 @@ def is_compatible(actual, formal, mode="default", accept_bigger_type=True):
     """
     Check that the list of actual types match the formal types' list.
     """
-    numeric_types = INTEGERS | FLOATS
+
+    # The same object is always compatible with itself, so skip the structural walk
+    if actual is formal:
+        return True
 
     # If both types are Concrete types then check compatibility of all elements of each one
     if hasattr(actual, "elements") and hasattr(formal, "elements"):
@@ -188,9 +202,9 @@ def is_compatible(actual, formal, mode="default", accept_bigger_type=True):
                is_compatible(actual.over["args"], formal.over["args"], mode)
     elif actual.name == "anytype":
         return True
-    elif actual in numeric_types and formal in numeric_types:
+    elif actual in NUMERICS and formal in NUMERICS:
         if util.AUTOMATIC_CASTING:
-            if actual.name in ["anyint", "anyfloat"] or formal.name in ["anyint", "anyfloat"]:
+            if actual.name in {"anyint", "anyfloat"} or formal.name in {"anyint", "anyfloat"}:
                 return True
             elif not accept_bigger_type:
                 return actual.bits <= formal.bits
@@ -339,7 +353,6 @@ def choose_bigger_type(left_type, right_type):
     In expressions, choosing the biggest type is important, because if a float number is converted to an integer,
     for example, you will lose information such as accuracy. Whereas in the opposite, this does not happen.
     """
-    numeric_types = INTEGERS | FLOATS
 
     def is_float(typ):
         return typ in FLOATS
@@ -380,7 +393,7 @@ def choose_bigger_type(left_type, right_type):
             return left_type
 
     # If types are both integers or both floats, but with different sizes, choose the one with the biggest size
-    if left_type in numeric_types and right_type in numeric_types:
+    if left_type in NUMERICS and right_type in NUMERICS:
         left_num_bits, right_num_bits = BASIC[left_type.name]["num_bits"], BASIC[right_type.name]["num_bits"]
         if right_num_bits is None:
             return left_type
@@ -406,6 +419,7 @@ def check_basic_type(typ):
             # If node represents an integer type then add it to the lists of integer types which are used by
             # other modules
             INTEGERS.add(typ)
+            NUMERICS.add(typ)
             if typ.signed:
                 SIGNED_INTEGERS.add(typ)
             else:
@@ -415,6 +429,7 @@ def check_basic_type(typ):
             # If node represents a float type then add it to the lists of float types which are used by
             # other modules
             FLOATS.add(typ)
+            NUMERICS.add(typ)
 
 
 class ReprId(object):
@@ -662,7 +677,7 @@ def create_type_or_trait(node, name, internal_name, type_vars={}):
     if isinstance(node, ast.Class):
 
         # Create the 'id' attribute for types passed by reference
-        if typ.name not in BASIC and typ.name not in ["UnwEx", "Exception"]:
+        if typ.name not in BASIC and typ.name not in {"UnwEx", "Exception"}:
             typ.attributes["id"] = {"idx": 0, "type": ast.Type(None, "uint")}
             start = 1
         else:
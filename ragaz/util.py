@@ -93,6 +93,47 @@ class ScopesDict(object):
         return self[key] if key in self else default
 
 
+class FlatScopesDict(object):
+    """
+    Dictionary with the same purpose of `ScopesDict`, but which keeps the items of all nested scopes in a single
+    dictionary. The keys set in each scope (and the values they hid, if any) are logged in a stack, so they are restored
+    when the scope ends. Thus a lookup costs the same regardless of how deep the current scope is.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.scopes = [[]]
+
+    def __repr__(self):
+        return "<FlatScopesDict({items!r})>".format(items=self.items)
+
+    def begin_scope(self):
+        self.scopes.append([])
+
+    def end_scope(self):
+        for key, hidden_value in reversed(self.scopes.pop()):
+            if hidden_value is None:
+                del self.items[key]
+            else:
+                self.items[key] = hidden_value
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __getitem__(self, key):
+        if key in self.items:
+            return self.items[key]
+        else:
+            assert False, "Item not found: {item}".format(item=key)
+
+    def __setitem__(self, key, value):
+        self.scopes[-1].append((key, self.items.get(key, None)))
+        self.items[key] = value
+
+    def get(self, key, default=None):
+        return self.items.get(key, default)
+
+
 def show_message(msg_type, messages, hints):
     """
     Helper function to print useful error messages.
@@ -1,10 +1,14 @@
 from __future__ import print_function
 import json
 import os
+import pickle
+import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
-from ragaz import util
+from unittest import mock
+from ragaz import compiler, parser, util
 from ragaz.compiler import show_pretty_ir, compile
 
 DIR = os.path.dirname(__file__)
@@ -91,6 +95,55 @@ class RagazTest(unittest.TestCase):
             self.assertEqual(expected[2], res[2])
 
 
+class CoreCacheTest(unittest.TestCase):
+    """
+    Check that an invalid cache of the CORE module's AST is parsed again and replaced by a valid one.
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, "__builtins__.zzc")
+        self.core_file = os.path.join(util.CORE_DIR, "__builtins__.zz")
+        with open(self.core_file) as f:
+            self.src = f.read() + "\n"
+        patcher = mock.patch.object(compiler, "CORE_AST_CACHE_FILE", self.cache_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def check_regenerated(self):
+        root_node = compiler.parse_core_file(self.core_file, self.src)
+        self.assertIsNotNone(root_node)
+        self.assertEqual(os.listdir(self.cache_dir), ["__builtins__.zzc"])
+
+        # The regenerated cache must be used by the next compilation without parsing the file again
+        with mock.patch.object(parser, "parse", side_effect=AssertionError("cache wasn't used")):
+            cached_root_node = compiler.parse_core_file(self.core_file, self.src)
+        self.assertEqual(type(cached_root_node), type(root_node))
+
+    def test_corrupt_cache(self):
+        with open(self.cache_file, "wb") as f:
+            f.write(b"not a pickle")
+        self.check_regenerated()
+
+    def test_truncated_cache(self):
+        with open(self.cache_file, "wb") as f:
+            f.write(pickle.dumps(("key", None))[:5])
+        self.check_regenerated()
+
+    def test_stale_cache(self):
+        with open(self.cache_file, "wb") as f:
+            pickle.dump(("stale key", None), f)
+        self.check_regenerated()
+
+    def test_other_version_cache(self):
+
+        # The AST of another version refers to a module that doesn't exist anymore, thus it must not be unpickled
+        with open(self.cache_file, "wb") as f:
+            f.write(b"0" * 40 + b"\n" + b"cragaz.removed_module\nNode\n.")
+        self.check_regenerated()
+
+
 def get_tests_from_dir(sub_dir):
     tests = []
     test_dir = os.path.join(DIR, "tests", sub_dir)
@@ -111,6 +164,7 @@ def get_all_tests():
 def suite():
     suite = unittest.TestSuite()
     suite.addTests(get_all_tests())
+    suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(CoreCacheTest))
     return suite
 
 